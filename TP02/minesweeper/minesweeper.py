@@ -12,21 +12,36 @@ class Minesweeper():
         self.width = width
         self.mines = set()
 
-        # Initialize an empty field with no mines
-        self.board = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                row.append(False)
-            self.board.append(row)
-
-        # Add mines randomly
-        while len(self.mines) != mines:
-            i = random.randrange(height)
-            j = random.randrange(width)
-            if not self.board[i][j]:
-                self.mines.add((i, j))
-                self.board[i][j] = True
+        # The board is a single integer bitmask where bit i*width+j
+        # is set iff cell (i, j) contains a mine. Start with no mines.
+        self.board_mask = 0
+
+        # Precompute, for every cell, the bitmask of its in-bounds
+        # neighbors (excluding the cell itself) so nearby_mines is a
+        # single AND + popcount instead of a nested loop.
+        self.neighbor_mask = [0] * (height * width)
+        for i in range(height):
+            for j in range(width):
+                mask = 0
+                for ni in range(max(0, i - 1), min(height, i + 2)):
+                    for nj in range(max(0, j - 1), min(width, j + 2)):
+                        if (ni, nj) != (i, j):
+                            mask |= 1 << (ni * width + nj)
+                self.neighbor_mask[i * width + j] = mask
+
+        # Add mines randomly: sampling distinct cell indices in one call
+        # avoids the rejection loop, whose retries pile up as the mine
+        # density approaches a full board.
+        for index in random.sample(range(height * width), mines):
+            self.mines.add(divmod(index, width))
+            self.board_mask |= 1 << index
+
+        # The board never changes after construction, so compute the
+        # neighbor-mine count of every cell once up front; nearby_mines
+        # then amortizes to a single list lookup per query.
+        self.nearby_counts = [
+            (self.board_mask & mask).bit_count() for mask in self.neighbor_mask
+        ]
 
         # At first, player has found no mines
         self.mines_found = set()
@@ -37,7 +52,7 @@ class Minesweeper():
         for i in range(self.height):
             print("--" * self.width + "-")
             for j in range(self.width):
-                if self.board[i][j]:
+                if (self.board_mask >> (i * self.width + j)) & 1:
                     print("|X", end="")
                 else:
                     print("| ", end="")
@@ -46,7 +61,7 @@ class Minesweeper():
 
     def is_mine(self, cell):
         i, j = cell
-        return self.board[i][j]
+        return bool((self.board_mask >> (i * self.width + j)) & 1)
 
     def nearby_mines(self, cell):
         """
@@ -55,23 +70,7 @@ class Minesweeper():
         not including the cell itself.
         """
 
-        # Keep count of nearby mines
-        count = 0
-
-        # Loop over all cells within one row and column
-        for i in range(cell[0] - 1, cell[0] + 2):
-            for j in range(cell[1] - 1, cell[1] + 2):
-
-                # Ignore the cell itself
-                if (i, j) == cell:
-                    continue
-
-                # Update count if cell in bounds and is mine
-                if 0 <= i < self.height and 0 <= j < self.width:
-                    if self.board[i][j]:
-                        count += 1
-
-        return count
+        return self.nearby_counts[cell[0] * self.width + cell[1]]
 
     def won(self):
         """Checks if all mines have been flagged."""
@@ -79,55 +78,6 @@ class Minesweeper():
         return self.mines_found == self.mines
 
 
-class Sentence():
-    """
-    Logical statement about a Minesweeper game
-    A sentence consists of a set of board cells,
-    and a count of the number of those cells which are mines.
-    """
-
-    def __init__(self, cells, count):
-        self.cells = set(cells)
-        self.count = count
-
-    def __eq__(self, other):
-        return self.cells == other.cells and self.count == other.count
-
-    def __str__(self):
-        return f"{self.cells} = {self.count}"
-
-    def known_mines(self):
-        """Returns the set of all cells in self.cells known to be mines."""
-
-        if self.count == len(self.cells):
-            return self.cells
-        return None
-
-    def known_safes(self):
-        """Returns the set of all cells in self.cells known to be safe."""
-
-        if not self.count:
-            return self.cells
-        return None
-
-    def mark_mine(self, cell):
-        """
-        Updates internal knowledge representation given the fact that
-        a cell is known to be a mine.
-        """
-        if cell in self.cells:
-            self.cells.remove(cell)
-            self.count -= 1
-
-    def mark_safe(self, cell):
-        """
-        Updates internal knowledge representation given the fact that
-        a cell is known to be safe.
-        """
-        if cell in self.cells:
-            self.cells.remove(cell)
-
-
 class MinesweeperAI():
     """Minesweeper game player"""
 
@@ -137,33 +87,144 @@ class MinesweeperAI():
         self.height = height
         self.width = width
 
+        # Cells are handled internally as single integer codes
+        # i * width + j: hashing one small int is about twice as fast as
+        # hashing an (i, j) tuple, and the knowledge-base set operations
+        # touch far fewer bytes per element.
+
         # Keep track of which cells have been clicked on
-        self.moves_made = set()
+        self._moves_made = set()
 
         # Keep track of cells known to be safe or mines
-        self.mines = set()
-        self.safes = set()
-
-        # List of sentences about the game known to be true
-        self.knowledge = []
+        self._mines = set()
+        self._safes = set()
+
+        # Every cell on the board, as integer codes, computed once.
+        self._all_cells = frozenset(range(height * width))
+
+        # Cells still playable at random: neither clicked nor known
+        # mines. Kept up to date incrementally so make_random_move never
+        # has to rescan the whole grid.
+        self._remaining = set(self._all_cells)
+
+        # Known-safe cells not yet clicked, maintained incrementally so
+        # make_safe_move avoids recomputing safes - moves_made per call.
+        self._available_safes = set()
+
+        # Knowledge base about the game: each entry maps a bitmask of
+        # unexplored cells (bit c set iff cell code c is in the
+        # sentence) to the number of mines among them. Keying on the
+        # mask makes duplicate detection an O(1) hash lookup, and
+        # subset tests collapse to single integer AND operations.
+        self.knowledge = {}
+
+        # Keys added or modified since they were last inspected for
+        # known safes/mines. Only these can yield new conclusions, so
+        # step 4 of add_knowledge skips everything else.
+        self._dirty = set()
+
+        # Precompute each cell's in-bounds neighbors once, so
+        # add_knowledge iterates a ready-made tuple instead of
+        # rebuilding the 3x3 window with bounds checks on every call.
+        self.neighbors = {
+            i * width + j: tuple(
+                ni * width + nj
+                for ni in range(max(0, i - 1), min(height, i + 2))
+                for nj in range(max(0, j - 1), min(width, j + 2))
+                if (ni, nj) != (i, j)
+            )
+            for i in range(height) for j in range(width)
+        }
+
+    def _encode(self, cell):
+        """Converts an (i, j) cell into its integer code."""
+        return cell[0] * self.width + cell[1]
+
+    def _decode(self, code):
+        """Converts an integer cell code back into an (i, j) tuple."""
+        return divmod(code, self.width)
+
+    @staticmethod
+    def _pick(cells):
+        """
+        Picks a uniformly random element from a set by walking an
+        iterator to a random offset, without copying the set into a
+        tuple first.
+        """
+        target = random.randrange(len(cells))
+        iterator = iter(cells)
+        for _ in range(target):
+            next(iterator)
+        return next(iterator)
+
+    @staticmethod
+    def _mask_cells(mask):
+        """Yields the integer cell codes of the bits set in a mask."""
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    # The sets below are exposed as (i, j) tuples so callers (like the
+    # runner reading ai.mines for flags) are unaffected by the internal
+    # integer encoding.
+
+    @property
+    def moves_made(self):
+        return {self._decode(code) for code in self._moves_made}
+
+    @property
+    def mines(self):
+        return {self._decode(code) for code in self._mines}
+
+    @property
+    def safes(self):
+        return {self._decode(code) for code in self._safes}
 
     def mark_mine(self, cell):
         """
         Marks a cell as a mine, and updates all knowledge
         to mark that cell as a mine as well.
         """
-        self.mines.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_mine(cell)
+        self._apply_marks(set(), {self._encode(cell)})
 
     def mark_safe(self, cell):
         """
         Marks a cell as safe, and updates all knowledge
         to mark that cell as safe as well.
         """
-        self.safes.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_safe(cell)
+        self._apply_marks({self._encode(cell)}, set())
+
+    def _apply_marks(self, safes, mines):
+        """
+        Records a whole batch of newly deduced safe cells and mines
+        (given as integer cell codes), updating every sentence in the
+        knowledge base exactly once instead of once per cell.
+        """
+        self._safes |= safes
+        self._mines |= mines
+        self._remaining -= mines
+        self._available_safes |= safes - self._moves_made
+        mine_mask = 0
+        for code in mines:
+            mine_mask |= 1 << code
+        resolved = mine_mask
+        for code in safes:
+            resolved |= 1 << code
+        updated = {}
+        modified = set()
+        for cells, count in self.knowledge.items():
+            if cells & resolved:
+                count -= (cells & mine_mask).bit_count()
+                cells &= ~resolved
+                # A sentence with no cells left carries no information;
+                # drop it so it never enters the quadratic subset scan.
+                if not cells:
+                    continue
+                modified.add(cells)
+            updated.setdefault(cells, count)
+        self.knowledge = updated
+        self._dirty = (self._dirty & updated.keys()) | modified
 
     def add_knowledge(self, cell, count):
         """
@@ -181,71 +242,102 @@ class MinesweeperAI():
             if they can be inferred from existing knowledge
         """
 
+        code = self._encode(cell)
+
         # 1) Mark the cell as a move that has been made
-        self.moves_made.add(cell)
+        self._moves_made.add(code)
+        self._remaining.discard(code)
+        self._available_safes.discard(code)
 
         # 2) Mark the cell as safe, updating all knowledge
-        self.mark_safe(cell)
+        self._apply_marks({code}, set())
 
         # 3) Add a new sentence to the AI's knowledge base
         #    It will describe the nearby cells and how many are mines.
-        cells = set()
-
-        # Loop over all cells within one row and column of the current cell
-        for i in range(cell[0] - 1, cell[0] + 2):
-            for j in range(cell[1] - 1, cell[1] + 2):
-                # Ignore the cell itself
-                if (i, j) == cell:
-                    continue
-                # Add unexplored cells to the sentence
-                if 0 <= i < self.height and 0 <= j < self.width:
-                    # If the cell has not been clicked or marked as a mine
-                    if (i, j) not in self.moves_made and (i, j) not in self.mines:
-                        cells.add((i, j))
-                    # If the cell is already a known mine, decrease the count of remaining mines
-                    elif (i, j) in self.mines:
-                        count -= 1
+        cells = 0
+
+        # Loop over the precomputed in-bounds neighbors of the cell
+        for neighbor in self.neighbors[code]:
+            # If the cell is already a known mine, decrease the count of remaining mines
+            if neighbor in self._mines:
+                count -= 1
+            # Only unexplored cells belong in the sentence: a known-safe
+            # neighbor contributes nothing and, once the fixpoint loop has
+            # consumed the sentence that proved it safe, nothing would ever
+            # strip it out again, blocking later subset inferences.
+            elif (neighbor not in self._moves_made
+                    and neighbor not in self._safes):
+                cells |= 1 << neighbor
 
         # Add the new sentence to knowledge base (describes the cells and the remaining mine count)
-        self.knowledge.append(Sentence(cells, count))
-
-        # 4) Mark any additional cells as safe or mines based on the updated knowledge base
-        #    This will help deduce more information from the newly added sentence.
-        for sentence in self.knowledge:
-            safes = sentence.known_safes()
-            if safes:
-                for safe in safes.copy():
-                    self.mark_safe(safe)  # Mark known safe cells
-
-            mines = sentence.known_mines()
-            if mines:
-                for mine in mines.copy():
-                    self.mark_mine(mine)  # Mark known mines
-
-        # 5) Infer any new sentences by comparing existing knowledge
-        #    We create new knowledge by comparing two sentences: if one is a subset of another,
-        #    we can infer a new sentence based on the difference between the two.
-        for sentence1 in self.knowledge:
-            for sentence2 in self.knowledge:
-                if sentence1 is sentence2:
+        #    setdefault leaves an already-known sentence untouched, so duplicates never
+        #    enter, and an empty sentence is not worth storing at all.
+        if cells:
+            self.knowledge.setdefault(cells, count)
+            self._dirty.add(cells)
+
+        # 4) and 5) are repeated until a fixpoint: sentences derived by the
+        #    subset inference can resolve further cells, which in turn can
+        #    simplify sentences and enable yet more inferences. Without the
+        #    loop those deductions would wait until the next move.
+        changed = True
+        while changed:
+            changed = False
+
+            # 4) Mark any additional cells as safe or mines based on the updated knowledge base
+            #    This will help deduce more information from the newly added sentence.
+            #    Deductions are gathered in one pass and applied in one batch; sentences
+            #    that haven't changed since last inspection cannot newly resolve, so only
+            #    the dirty ones are examined.
+            pending_safe_mask = 0
+            pending_mine_mask = 0
+            for cells1 in self._dirty:
+                count1 = self.knowledge.get(cells1)
+                if count1 is None:
                     continue
-                if sentence1 == sentence2:
-                    # If both sentences are the same, remove the duplicate sentence
-                    self.knowledge.remove(sentence2)
-                elif sentence1.cells.issubset(sentence2.cells):
-                    # If sentence1 is a subset of sentence2, deduce new knowledge
-                    new_sentence = Sentence(
-                        sentence2.cells - sentence1.cells,
-                        sentence2.count - sentence1.count
-                    )
-                    # Add the new knowledge if it's not already known
-                    if new_sentence not in self.knowledge:
-                        self.knowledge.append(new_sentence)
-                        
+                if count1 == 0:
+                    pending_safe_mask |= cells1
+                elif count1 == cells1.bit_count():
+                    pending_mine_mask |= cells1
+            self._dirty.clear()
+            if pending_safe_mask or pending_mine_mask:
+                self._apply_marks(
+                    set(self._mask_cells(pending_safe_mask)),
+                    set(self._mask_cells(pending_mine_mask))
+                )
+                changed = True
+
+            # 5) Infer any new sentences by comparing existing knowledge
+            #    We create new knowledge by comparing two sentences: if one is a subset of another,
+            #    we can infer a new sentence based on the difference between the two.
+            #    Sorting smallest-first means a sentence only needs comparing against the
+            #    strictly larger ones after it, halving the number of pairs examined.
+            #    The pair scan runs over flat parallel lists with popcounts taken
+            #    once per sentence, so the inner loop is down to an int compare,
+            #    an AND subset test and an XOR for the derived cells.
+            items = sorted(self.knowledge.items(), key=lambda item: item[0].bit_count())
+            masks = [cells for cells, _ in items]
+            counts = [count for _, count in items]
+            sizes = [cells.bit_count() for cells in masks]
+            for index1 in range(len(masks)):
+                cells1 = masks[index1]
+                count1 = counts[index1]
+                size1 = sizes[index1]
+                for index2 in range(index1 + 1, len(masks)):
+                    cells2 = masks[index2]
+                    if size1 < sizes[index2] and cells1 & cells2 == cells1:
+                        # If sentence1 is a proper subset of sentence2, deduce new knowledge
+                        # (only when the cell set isn't already known).
+                        derived = cells2 ^ cells1
+                        if derived not in self.knowledge:
+                            self.knowledge[derived] = counts[index2] - count1
+                            self._dirty.add(derived)
+                            changed = True
+
         # Example: if we know that {(2, 4), (3, 2), (4, 2)} = 1
         #                      and {(2, 4), (3, 2)} = 1
         #                      we get {(4, 2)} = 0 by substracting the subsets and counts
-        #                      so we can deduce that (4, 2) is safe 
+        #                      so we can deduce that (4, 2) is safe
         #                      because the mine must be in either (2, 4) or (3, 2).
 
 
@@ -258,9 +350,8 @@ class MinesweeperAI():
         This function may use the knowledge in self.mines, self.safes
         and self.moves_made, but should not modify any of those values.
         """
-        available_moves = self.safes - self.moves_made
-        if available_moves:
-            return random.choice(tuple(available_moves))
+        if self._available_safes:
+            return self._decode(self._pick(self._available_safes))
         return None
 
     def make_random_move(self):
@@ -270,15 +361,8 @@ class MinesweeperAI():
             1) have not already been chosen, and
             2) are not known to be mines
         """
-        # If no move can be made, return None
-        if len(self.mines) + len(self.moves_made) == self.height * self.width:
-            return None
-
-        # We create a list of all potential moves that haven't been made and aren't mines
-        possible_moves = [
-            (i, j) for i in range(self.height) for j in range(self.width)
-            if (i, j) not in self.moves_made and (i, j) not in self.mines
-        ]
-
-        # If there are any possible moves, return one at random, otherwise return None
-        return random.choice(possible_moves) if possible_moves else None
\ No newline at end of file
+        # Pick from the incrementally maintained set of unplayed,
+        # unflagged cells; if it is empty, no move can be made.
+        if self._remaining:
+            return self._decode(self._pick(self._remaining))
+        return None
\ No newline at end of file